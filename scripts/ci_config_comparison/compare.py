@@ -12,14 +12,34 @@ Structure:
 
 Usage:
     python scripts/ci_config_comparison/compare.py [--old PATH] [--new PATH]
+        [--mappings PATH] [--no-cache] [--workers N] [--fail-fast] [--suggest]
 """
 
 import argparse
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import os
+import pickle
+import sys
 import yaml
 from pathlib import Path
 from dataclasses import dataclass, field
+from functools import cached_property
 from enum import Enum, auto
-from typing import Any, Optional
+from typing import AbstractSet, Any, Optional
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    import numpy  # rapidfuzz.process.cdist returns numpy arrays
+    from rapidfuzz.fuzz import ratio as fuzz_ratio
+    from rapidfuzz.process import cdist
+except ImportError:  # Optional: fall back to the pure-Python indel_ratio
+    cdist = None
 
 
 # =============================================================================
@@ -34,21 +54,57 @@ class MappingType(Enum):
     REMOVAL = auto()      # OLD X is intentionally removed (no NEW equivalent)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Mapping:
     """A mapping between an old item and a new item."""
     old_name: Optional[str]  # None for additions
     new_name: Optional[str]  # None for removals
     mapping_type: MappingType
     comment: str = ""  # User-provided explanation
+    # Registry key for this mapping's children: "old:new", "_:new" or "old:_"
+    bucket_key: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        if self.mapping_type == MappingType.ONE_TO_ONE:
-            assert self.old_name and self.new_name
-        elif self.mapping_type == MappingType.ADDITION:
-            assert self.new_name and not self.old_name
-        elif self.mapping_type == MappingType.REMOVAL:
-            assert self.old_name and not self.new_name
+        # Frozen, so set the derived field directly
+        object.__setattr__(self, "bucket_key",
+                           sys.intern(f"{self.old_name or '_'}:{self.new_name or '_'}"))
+        if __debug__:  # Compiled out under python -O
+            if self.mapping_type == MappingType.ONE_TO_ONE:
+                assert self.old_name and self.new_name
+            elif self.mapping_type == MappingType.ADDITION:
+                assert self.new_name and not self.old_name
+            elif self.mapping_type == MappingType.REMOVAL:
+                assert self.old_name and not self.new_name
+
+    ENTRY_KEYS = frozenset({"old", "new", "comment"})
+
+    @classmethod
+    def from_dict(cls, entry: dict, bucket: str = "") -> "Mapping":
+        """
+        Build a mapping from a mappings.yaml entry: {old, new, comment}.
+
+        The type follows from which names are present: both is one-to-one,
+        only new is an addition, only old is a removal. `bucket` names the
+        entry's level in error messages.
+        """
+        if not isinstance(entry, dict):
+            raise ValueError(f"Mapping entry in {bucket!r} must be a mapping "
+                             f"with old/new/comment, got {entry!r}")
+        unknown = entry.keys() - cls.ENTRY_KEYS
+        if unknown:
+            raise ValueError(f"Unknown key(s) {sorted(map(str, unknown))} in {bucket!r} "
+                             f"mapping entry {entry!r} (expected old, new, comment)")
+        old = entry.get("old")
+        new = entry.get("new")
+        if old and new:
+            mapping_type = MappingType.ONE_TO_ONE
+        elif new:
+            mapping_type = MappingType.ADDITION
+        elif old:
+            mapping_type = MappingType.REMOVAL
+        else:
+            raise ValueError(f"Mapping entry in {bucket!r} needs 'old' and/or 'new': {entry!r}")
+        return cls(old, new, mapping_type, entry.get("comment", ""))
 
 
 @dataclass
@@ -56,16 +112,25 @@ class ComparisonResult:
     """Result of comparing items at one level."""
     level: str  # e.g., "workflows", "jobs", "steps"
     mapped: list[Mapping] = field(default_factory=list)
-    unmapped_old: list[str] = field(default_factory=list)  # In OLD but not mapped
-    unmapped_new: list[str] = field(default_factory=list)  # In NEW but not mapped
+    unmapped_old: frozenset[str] = frozenset()  # In OLD but not mapped
+    unmapped_new: frozenset[str] = frozenset()  # In NEW but not mapped
 
     @property
     def is_fully_mapped(self) -> bool:
-        return len(self.unmapped_old) == 0 and len(self.unmapped_new) == 0
+        return not self.unmapped_old and not self.unmapped_new
 
     @property
     def has_unmapped(self) -> bool:
-        return len(self.unmapped_old) > 0 or len(self.unmapped_new) > 0
+        return bool(self.unmapped_old) or bool(self.unmapped_new)
+
+    # Sorted only when a report actually prints them
+    @cached_property
+    def unmapped_old_sorted(self) -> list[str]:
+        return sorted(self.unmapped_old)
+
+    @cached_property
+    def unmapped_new_sorted(self) -> list[str]:
+        return sorted(self.unmapped_new)
 
 
 # =============================================================================
@@ -79,52 +144,87 @@ class MappingsRegistry:
 
     This is where user-approved mappings are stored.
     The registry is hierarchical: workflows → jobs → steps → etc.
+    Mappings are filed under their comparison level ("workflows",
+    "jobs:<workflow_key>", "steps:<job_key>", "commands", "parameters",
+    "orbs") and only enter through add_*/load_from_dict, so the mapped-name
+    sets used for the unmapped counts always agree with the mapping lists.
     """
 
     def __init__(self):
-        self.workflows: list[Mapping] = []
-        self.jobs: dict[str, list[Mapping]] = {}  # workflow_key -> job mappings
-        self.steps: dict[str, list[Mapping]] = {}  # job_key -> step mappings
-        self.commands: list[Mapping] = []
-        self.parameters: list[Mapping] = []
-        self.orbs: list[Mapping] = []
+        # Built keys are sys.intern'ed here and in Comparator so lookups
+        # between the two compare by identity.
+        self._mappings_by_bucket: defaultdict[str, list[Mapping]] = defaultdict(list)
+        self._mapped_old_by_bucket: defaultdict[str, set[str]] = defaultdict(set)
+        self._mapped_new_by_bucket: defaultdict[str, set[str]] = defaultdict(set)
+
+    def _add(self, bucket: str, mappings: list[Mapping]):
+        """File mappings under a comparison level and record the names they cover."""
+        self._mappings_by_bucket[bucket].extend(mappings)
+        self._mapped_old_by_bucket[bucket].update(m.old_name for m in mappings if m.old_name)
+        self._mapped_new_by_bucket[bucket].update(m.new_name for m in mappings if m.new_name)
+
+    def load_from_dict(self, data: dict):
+        """
+        Add every mapping from a parsed mappings.yaml in bulk.
+
+        Layout: workflows/commands/parameters/orbs are lists of entries, jobs
+        is keyed by workflow key and steps by job key (see Mapping.from_dict).
+        """
+        def add(bucket: str, entries):
+            self._add(bucket, [Mapping.from_dict(entry, bucket) for entry in entries or ()])
+
+        add("workflows", data.get("workflows"))
+        for workflow_key, entries in (data.get("jobs") or {}).items():
+            add(sys.intern(f"jobs:{workflow_key}"), entries)
+        for job_key, entries in (data.get("steps") or {}).items():
+            add(sys.intern(f"steps:{job_key}"), entries)
+        for bucket in ("commands", "parameters", "orbs"):
+            add(bucket, data.get(bucket))
 
     def add_workflow_mapping(self, old: Optional[str], new: Optional[str],
                             mapping_type: MappingType, comment: str = ""):
-        self.workflows.append(Mapping(old, new, mapping_type, comment))
+        self._add("workflows", [Mapping(old, new, mapping_type, comment)])
 
     def add_job_mapping(self, workflow_key: str, old: Optional[str], new: Optional[str],
                        mapping_type: MappingType, comment: str = ""):
-        if workflow_key not in self.jobs:
-            self.jobs[workflow_key] = []
-        self.jobs[workflow_key].append(Mapping(old, new, mapping_type, comment))
+        self._add(sys.intern(f"jobs:{workflow_key}"), [Mapping(old, new, mapping_type, comment)])
 
     def add_step_mapping(self, job_key: str, old: Optional[str], new: Optional[str],
                         mapping_type: MappingType, comment: str = ""):
-        if job_key not in self.steps:
-            self.steps[job_key] = []
-        self.steps[job_key].append(Mapping(old, new, mapping_type, comment))
+        self._add(sys.intern(f"steps:{job_key}"), [Mapping(old, new, mapping_type, comment)])
 
     def add_command_mapping(self, old: Optional[str], new: Optional[str],
                            mapping_type: MappingType, comment: str = ""):
-        self.commands.append(Mapping(old, new, mapping_type, comment))
+        self._add("commands", [Mapping(old, new, mapping_type, comment)])
 
     def add_parameter_mapping(self, old: Optional[str], new: Optional[str],
                              mapping_type: MappingType, comment: str = ""):
-        self.parameters.append(Mapping(old, new, mapping_type, comment))
+        self._add("parameters", [Mapping(old, new, mapping_type, comment)])
 
     def add_orb_mapping(self, old: Optional[str], new: Optional[str],
                        mapping_type: MappingType, comment: str = ""):
-        self.orbs.append(Mapping(old, new, mapping_type, comment))
+        self._add("orbs", [Mapping(old, new, mapping_type, comment)])
+
+    def mappings(self, bucket: str) -> list[Mapping]:
+        """Mappings filed under a comparison level (read-only by convention)."""
+        return self._mappings_by_bucket.get(bucket, [])
+
+    def mapped_old(self, bucket: str) -> AbstractSet[str]:
+        """OLD names covered by mappings at a comparison level."""
+        return self._mapped_old_by_bucket.get(bucket, frozenset())
+
+    def mapped_new(self, bucket: str) -> AbstractSet[str]:
+        """NEW names covered by mappings at a comparison level."""
+        return self._mapped_new_by_bucket.get(bucket, frozenset())
 
     def get_workflow_mappings(self) -> list[Mapping]:
-        return self.workflows
+        return self.mappings("workflows")
 
     def get_job_mappings(self, workflow_key: str) -> list[Mapping]:
-        return self.jobs.get(workflow_key, [])
+        return self.mappings(f"jobs:{workflow_key}")
 
     def get_step_mappings(self, job_key: str) -> list[Mapping]:
-        return self.steps.get(job_key, [])
+        return self.mappings(f"steps:{job_key}")
 
 
 # =============================================================================
@@ -132,23 +232,253 @@ class MappingsRegistry:
 # =============================================================================
 
 
-def load_yaml(path: Path) -> dict:
-    """Load a YAML file."""
-    with open(path) as f:
-        return yaml.safe_load(f)
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "cigen_compare"
 
 
-@dataclass
-class ConfigPair:
-    """A pair of configs to compare."""
-    old_path: Path
-    new_path: Path
-    old_config: dict = field(default_factory=dict)
-    new_config: dict = field(default_factory=dict)
+# Bump whenever parsing/extraction code changes what gets cached
+_CACHE_VERSION = 3
+
+
+def _cache_prefix(path: Path, kind: str) -> str:
+    """Cache file name prefix shared by every version of one file's cache of one kind."""
+    return hashlib.sha1(f"{path.resolve()}\0{kind}".encode()).hexdigest()
+
+
+def _cache_path(path: Path, kind: str, fingerprint: str = "") -> Path:
+    """Cache file for a parsed config, keyed by path, kind, mtime, size and code version."""
+    stat = path.resolve().stat()
+    version = f"{stat.st_mtime_ns}\0{stat.st_size}\0{_CACHE_VERSION}\0{fingerprint}"
+    version_hash = hashlib.sha1(version.encode()).hexdigest()
+    return CACHE_DIR / f"{_cache_prefix(path, kind)}-{version_hash}.pkl"
+
+
+def _prune_cache(path: Path, kind: str, keep: Path):
+    """Remove cache files for earlier versions of the same file and kind."""
+    for stale in CACHE_DIR.glob(f"{_cache_prefix(path, kind)}-*.pkl"):
+        if stale != keep:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
 
-    def load(self):
-        self.old_config = load_yaml(self.old_path)
-        self.new_config = load_yaml(self.new_path)
+
+def _load_cached(path: Path, kind: str, parse, use_cache: bool, fingerprint: str = "") -> Any:
+    """
+    Parse a file, reusing a pickled result from CACHE_DIR when possible.
+
+    Editing a file changes its mtime, which changes the cache key; the stale
+    entry is removed when the new one is written. `fingerprint` covers
+    anything else the parsed result depends on (e.g. an extraction schema).
+    """
+    cache_file = _cache_path(path, kind, fingerprint) if use_cache else None
+    if cache_file is not None:
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+    data = parse(path)
+
+    if cache_file is not None:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+            _prune_cache(path, kind, keep=cache_file)
+        except OSError:
+            pass  # Caching is best-effort
+
+    return data
+
+
+def _parse_yaml(path: Path) -> Any:
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def load_yaml(path: Path, use_cache: bool = True) -> dict:
+    """Load a whole YAML file (with the libyaml C loader when available)."""
+    return _load_cached(path, "yaml", _parse_yaml, use_cache)
+
+
+# Extraction schemas: which parts of a config the comparator reads.
+#   FULL      - construct the value as yaml.safe_load would
+#   None      - skip the value (kept as None when its key is kept)
+#   {k: s}    - mapping: keep listed keys ("*" matches any other key), drop the rest
+#   [s]       - sequence: extract every item with schema s
+FULL = "full"
+_STEP_SCHEMA = {"run": {"name": FULL}, "*": None}  # Enough for get_step_identifier
+CONFIG_SCHEMA = {
+    "workflows": {"*": {"jobs": [{"*": None}]}},
+    "jobs": {"*": {"steps": [_STEP_SCHEMA]}},
+    "commands": {"*": None},
+    "parameters": {"*": None},
+    "orbs": {"*": None},
+}
+
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+_VALUE_TAG = "tag:yaml.org,2002:value"
+_STR_TAG = "tag:yaml.org,2002:str"
+
+
+class ExtractingLoader:
+    """
+    Build a pruned config from the YAML event stream.
+
+    Only the parts named by a schema are materialized; everything else (job
+    docker/environment blocks, shell script bodies, ...) is read past without
+    building Python objects. Anchored nodes are always built in full so that
+    aliases and merge keys (<<) elsewhere resolve exactly as they would with
+    yaml.safe_load.
+    """
+
+    def __init__(self, stream, schema: dict = CONFIG_SCHEMA):
+        self._events = yaml.parse(stream, Loader=SafeLoader)
+        self._schema = schema
+        self._anchors: dict[str, Any] = {}
+        self._resolver = yaml.resolver.Resolver()
+        self._constructor = yaml.constructor.SafeConstructor()
+
+    def load(self) -> Any:
+        """Extract the stream's single document (None if empty), like yaml.safe_load."""
+        root = None
+        document_mark = None
+        for event in self._events:
+            if isinstance(event, yaml.DocumentStartEvent):
+                if document_mark is not None:
+                    raise yaml.composer.ComposerError(
+                        "expected a single document in the stream", document_mark,
+                        "but found another document", event.start_mark)
+                document_mark = event.start_mark
+                root = self._node(next(self._events), self._schema)
+        return root
+
+    def _children(self):
+        """Yield the start events of a collection's children, consuming its end event."""
+        for event in self._events:
+            if isinstance(event, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+                return
+            yield event
+
+    def _node(self, event, schema) -> Any:
+        if isinstance(event, yaml.AliasEvent):
+            if event.anchor not in self._anchors:
+                raise yaml.composer.ComposerError(
+                    None, None, f"found undefined alias {event.anchor!r}", event.start_mark)
+            return self._anchors[event.anchor]
+        if event.anchor is not None:
+            schema = FULL  # Aliases elsewhere may need any part of this node
+        if schema is None:
+            self._skip(event)
+            return None
+
+        if isinstance(event, yaml.ScalarEvent):
+            value = self._scalar(event)
+        elif isinstance(event, yaml.SequenceStartEvent):
+            self._check_tag(event)
+            item_schema = schema[0] if isinstance(schema, list) else FULL
+            value = [self._node(child, item_schema) for child in self._children()]
+        else:
+            self._check_tag(event)
+            value = self._mapping(schema if isinstance(schema, dict) else FULL)
+
+        if event.anchor is not None:
+            self._anchors[event.anchor] = value
+        return value
+
+    def _skip(self, event):
+        """
+        Read past a node, still building any anchored node so later aliases
+        resolve, and rejecting unknown tags as yaml.safe_load would.
+        """
+        if isinstance(event, yaml.AliasEvent):
+            return
+        if event.anchor is not None:
+            self._node(event, FULL)
+            return
+        self._check_tag(event)
+        if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+            for child in self._children():
+                self._skip(child)
+
+    def _check_tag(self, event):
+        """Raise for an explicit tag SafeConstructor cannot construct."""
+        if event.tag not in (None, "!") and event.tag not in self._constructor.yaml_constructors:
+            raise yaml.constructor.ConstructorError(
+                None, None, f"could not determine a constructor for the tag {event.tag!r}",
+                event.start_mark)
+
+    def _scalar_tag(self, event) -> str:
+        if event.tag is None or event.tag == "!":
+            return self._resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+        return event.tag
+
+    def _scalar(self, event) -> Any:
+        tag = self._scalar_tag(event)
+        if tag == _VALUE_TAG:
+            tag = _STR_TAG
+        construct = self._constructor.yaml_constructors.get(tag)
+        if construct is None:
+            raise yaml.constructor.ConstructorError(
+                None, None, f"could not determine a constructor for the tag {tag!r}",
+                event.start_mark)
+        node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+        return construct(self._constructor, node)
+
+    def _mapping(self, schema) -> dict:
+        merged: list[tuple[Any, Any]] = []
+        explicit: list[tuple[Any, Any]] = []
+        children = self._children()
+        for key_event in children:
+            if isinstance(key_event, yaml.ScalarEvent) and self._scalar_tag(key_event) == _MERGE_TAG:
+                value_event = next(children)
+                merged.extend(self._merge_items(self._node(value_event, FULL), value_event))
+                continue
+
+            key = self._node(key_event, FULL)
+            value_event = next(children)
+            if schema == FULL:
+                value_schema = FULL
+            elif key in schema:
+                value_schema = schema[key]
+            elif "*" in schema:
+                value_schema = schema["*"]
+            else:
+                self._skip(value_event)
+                continue
+            explicit.append((key, self._node(value_event, value_schema)))
+
+        # Same precedence as SafeConstructor.flatten_mapping: merged keys come
+        # first and explicit keys override them.
+        return dict(merged + explicit)
+
+    @staticmethod
+    def _merge_items(value, event) -> list[tuple[Any, Any]]:
+        if isinstance(value, dict):
+            return list(value.items())
+        if isinstance(value, list) and all(isinstance(v, dict) for v in value):
+            items = []
+            for submapping in reversed(value):
+                items.extend(submapping.items())
+            return items
+        raise yaml.constructor.ConstructorError(
+            "while constructing a mapping", None,
+            "expected a mapping or list of mappings for merging", event.start_mark)
+
+
+def extract_config(path: Path) -> dict:
+    """Load only the parts of a config described by CONFIG_SCHEMA."""
+    with open(path, "rb") as f:
+        return ExtractingLoader(f).load() or {}
+
+
+def load_config(path: Path, use_cache: bool = True) -> dict:
+    """Load the parts of a config the comparator reads, via ExtractingLoader."""
+    return _load_cached(path, "extract", extract_config, use_cache,
+                        fingerprint=repr(CONFIG_SCHEMA))
 
 
 # =============================================================================
@@ -156,9 +486,9 @@ class ConfigPair:
 # =============================================================================
 
 
-def get_workflow_names(config: dict) -> set[str]:
+def get_workflow_names(config: dict) -> frozenset[str]:
     """Get workflow names from a config."""
-    return set(config.get("workflows", {}).keys())
+    return frozenset(config.get("workflows", {}))
 
 
 def get_workflow_jobs(config: dict, workflow_name: str) -> list[str]:
@@ -174,9 +504,9 @@ def get_workflow_jobs(config: dict, workflow_name: str) -> list[str]:
     return result
 
 
-def get_job_names(config: dict) -> set[str]:
+def get_job_names(config: dict) -> frozenset[str]:
     """Get job definition names from a config."""
-    return set(config.get("jobs", {}).keys())
+    return frozenset(config.get("jobs", {}))
 
 
 def get_job_steps(config: dict, job_name: str) -> list[dict]:
@@ -185,35 +515,233 @@ def get_job_steps(config: dict, job_name: str) -> list[dict]:
     return job.get("steps", [])
 
 
+def _step_id_str(step: str) -> str:
+    return step
+
+
+def _step_id_dict(step: dict) -> str:
+    key = next(iter(step), None)
+    if key is None:
+        return str(step)
+    if key == "run":
+        run = step["run"]
+        if isinstance(run, dict):
+            name = run.get("name", "")
+            if name:
+                return f"run:{name}"
+    return key
+
+
+# Parsed YAML steps are exactly str or dict, so dispatch on the concrete type
+_STEP_ID_BY_TYPE = {str: _step_id_str, dict: _step_id_dict}
+
+
 def get_step_identifier(step: Any) -> str:
     """Get a unique identifier for a step."""
-    if isinstance(step, str):
-        return step
-    if isinstance(step, dict):
-        keys = list(step.keys())
-        if keys:
-            key = keys[0]
-            if key == "run" and isinstance(step[key], dict):
-                name = step[key].get("name", "")
-                if name:
-                    return f"run:{name}"
-            return key
+    step_id = _STEP_ID_BY_TYPE.get(type(step))
+    if step_id is not None:
+        return step_id(step)
     return str(step)
 
 
-def get_command_names(config: dict) -> set[str]:
+def get_command_names(config: dict) -> frozenset[str]:
     """Get command names from a config."""
-    return set(config.get("commands", {}).keys())
+    return frozenset(config.get("commands", {}))
 
 
-def get_parameter_names(config: dict) -> set[str]:
+def get_parameter_names(config: dict) -> frozenset[str]:
     """Get parameter names from a config."""
-    return set(config.get("parameters", {}).keys())
+    return frozenset(config.get("parameters", {}))
 
 
-def get_orb_names(config: dict) -> set[str]:
+def get_orb_names(config: dict) -> frozenset[str]:
     """Get orb names from a config."""
-    return set(config.get("orbs", {}).keys())
+    return frozenset(config.get("orbs", {}))
+
+
+# =============================================================================
+# Config Index - Items extracted once per config
+# =============================================================================
+
+
+@dataclass
+class ConfigIndex:
+    """
+    Everything the comparator reads from a config, extracted in a single pass.
+
+    Built once per config so each comparison level is a lookup instead of
+    another walk through the nested YAML dicts.
+    """
+    workflow_names: frozenset[str] = frozenset()
+    workflow_jobs: dict[str, tuple[str, ...]] = field(default_factory=dict)  # workflow -> job ids
+    job_names: frozenset[str] = frozenset()
+    job_step_ids: dict[str, frozenset[str]] = field(default_factory=dict)  # job -> step ids
+    command_names: frozenset[str] = frozenset()
+    parameter_names: frozenset[str] = frozenset()
+    orb_names: frozenset[str] = frozenset()
+
+    @classmethod
+    def build(cls, config: dict) -> "ConfigIndex":
+        workflows = config.get("workflows", {})
+        jobs = config.get("jobs", {})
+        return cls(
+            workflow_names=get_workflow_names(config),
+            workflow_jobs={
+                name: tuple(get_workflow_jobs(config, name))
+                for name, workflow in workflows.items()
+                if isinstance(workflow, dict)
+            },
+            job_names=get_job_names(config),
+            job_step_ids={
+                name: frozenset(get_step_identifier(s) for s in get_job_steps(config, name))
+                for name, job in jobs.items()
+                if isinstance(job, dict)
+            },
+            command_names=get_command_names(config),
+            parameter_names=get_parameter_names(config),
+            orb_names=get_orb_names(config),
+        )
+
+
+@dataclass
+class ConfigPair:
+    """A pair of configs to compare."""
+    old_path: Path
+    new_path: Path
+    old_config: dict = field(default_factory=dict)  # Only the parts in CONFIG_SCHEMA
+    new_config: dict = field(default_factory=dict)
+    old_index: ConfigIndex = field(default_factory=ConfigIndex)
+    new_index: ConfigIndex = field(default_factory=ConfigIndex)
+
+    def load(self, use_cache: bool = True, workers: int = 1):
+        """
+        Load both configs and build their indexes.
+
+        With workers > 1 the two files are parsed in separate processes. Parsing
+        holds the GIL, so threads would not overlap, and the extracted configs
+        are small to send back.
+        """
+        paths = (self.old_path, self.new_path)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+                self.old_config, self.new_config = pool.map(
+                    load_config, paths, (use_cache,) * len(paths)
+                )
+        else:
+            self.old_config, self.new_config = (load_config(p, use_cache) for p in paths)
+        self.old_index = ConfigIndex.build(self.old_config)
+        self.new_index = ConfigIndex.build(self.new_config)
+
+
+# =============================================================================
+# Mapping Suggestions - Candidate one-to-one mappings for unmapped names
+# =============================================================================
+
+
+def indel_ratio(a: str, b: str) -> float:
+    """
+    Normalized Indel similarity: 2 * LCS(a, b) / (len(a) + len(b)).
+
+    This is the metric rapidfuzz.fuzz.ratio computes (scaled to [0, 1]), so
+    suggestions do not depend on whether rapidfuzz is installed.
+    """
+    if not a and not b:
+        return 1.0
+    # Longest common subsequence, one DP row at a time
+    previous = [0] * (len(b) + 1)
+    for char_a in a:
+        current = [0]
+        for j, char_b in enumerate(b):
+            if char_a == char_b:
+                current.append(previous[j] + 1)
+            else:
+                current.append(max(previous[j + 1], current[j]))
+        previous = current
+    return 2 * previous[-1] / (len(a) + len(b))
+
+
+def similarity_matrix(old_names: list[str], new_names: list[str]) -> list[list[float]]:
+    """
+    Pairwise name similarity in [0, 1], rows = OLD, columns = NEW.
+
+    Uses rapidfuzz's C++ cdist when installed, otherwise indel_ratio. Both
+    compute the same normalized Indel similarity.
+    """
+    if cdist is not None and old_names and new_names:
+        scores = cdist(old_names, new_names, scorer=fuzz_ratio, dtype=numpy.float64)
+        return (scores / 100.0).tolist()
+    return [[indel_ratio(old, new) for new in new_names] for old in old_names]
+
+
+def mutual_best_pairs(scores: list[list[float]],
+                      min_similarity: float) -> list[tuple[int, int]]:
+    """
+    Pair rows and columns of a score matrix by bidirectional best match.
+
+    Each round pairs every row whose best column also has that row as its
+    best, provided the score reaches ``min_similarity``, then removes both and
+    looks again. Ties go to the lowest index, so equal scores can hold a pair
+    back until the competing row or column has been matched. Only the best
+    matches invalidated by a round are recomputed, so each round costs time
+    proportional to what it removed rather than the whole matrix.
+    """
+    rows = list(range(len(scores)))
+    cols = list(range(len(scores[0]) if len(scores) else 0))
+    if not cols:
+        return []
+
+    def best_col(i: int) -> int:
+        return max(cols, key=lambda j: scores[i][j])
+
+    def best_row(j: int) -> int:
+        return max(rows, key=lambda i: scores[i][j])
+
+    row_best = {i: best_col(i) for i in rows}
+    col_best = {j: best_row(j) for j in cols}
+
+    pairs = []
+    while rows and cols:
+        matched = [(i, row_best[i]) for i in rows
+                   if col_best[row_best[i]] == i
+                   and scores[i][row_best[i]] >= min_similarity]
+        if not matched:
+            break
+        pairs.extend(matched)
+
+        matched_rows = {i for i, _ in matched}
+        matched_cols = {j for _, j in matched}
+        rows = [i for i in rows if i not in matched_rows]
+        cols = [j for j in cols if j not in matched_cols]
+        if not (rows and cols):
+            break
+        # A best match that survived the round is still the first maximum
+        # over the smaller set, so only the displaced ones need a rescan.
+        for i in rows:
+            if row_best[i] in matched_cols:
+                row_best[i] = best_col(i)
+        for j in cols:
+            if col_best[j] in matched_rows:
+                col_best[j] = best_row(j)
+
+    return pairs
+
+
+def auto_suggest_mappings(old_names: AbstractSet[str], new_names: AbstractSet[str],
+                          min_similarity: float = 0.5) -> list[Mapping]:
+    """
+    Suggest one-to-one mappings by bidirectional best match.
+
+    See ``mutual_best_pairs`` for the matching rule. Suggestions still need
+    user approval before they go into the registry.
+    """
+    old = sorted(old_names)
+    new = sorted(new_names)
+    scores = similarity_matrix(old, new)
+    return [
+        Mapping(old[i], new[j], MappingType.ONE_TO_ONE,
+                f"auto-suggested, similarity={scores[i][j]:.2f}")
+        for i, j in mutual_best_pairs(scores, min_similarity)
+    ]
 
 
 # =============================================================================
@@ -228,106 +756,84 @@ class Comparator:
     Compares OLD ↔ NEW at each level, stopping at unmapped items.
     """
 
-    def __init__(self, config_pair: ConfigPair, registry: MappingsRegistry):
+    def __init__(self, config_pair: ConfigPair, registry: MappingsRegistry,
+                 fail_fast: bool = False):
         self.old = config_pair.old_config
         self.new = config_pair.new_config
+        self.old_index = config_pair.old_index
+        self.new_index = config_pair.new_index
         self.registry = registry
+        self.fail_fast = fail_fast  # Stop at the first workflow with unmapped jobs
         self.results: dict[str, ComparisonResult] = {}
 
-    def compare_level(self, level: str, old_items: set[str], new_items: set[str],
-                     mappings: list[Mapping]) -> ComparisonResult:
-        """Compare items at a single level using the provided mappings."""
-        result = ComparisonResult(level=level)
-
-        # Track which items are covered by mappings
-        mapped_old = set()
-        mapped_new = set()
+    def compare_level(self, level: str, old_items: frozenset[str],
+                      new_items: frozenset[str]) -> ComparisonResult:
+        """
+        Compare items at a single level using the registry's mappings for that level.
 
-        for mapping in mappings:
-            result.mapped.append(mapping)
-            if mapping.old_name:
-                mapped_old.add(mapping.old_name)
-            if mapping.new_name:
-                mapped_new.add(mapping.new_name)
+        ``level`` must be a registry bucket key ("workflows", "jobs:<workflow_key>",
+        "steps:<job_key>", "commands", "parameters" or "orbs"); both the mapped
+        list and the unmapped sets are read from that bucket.
+        """
+        result = ComparisonResult(level=level, mapped=list(self.registry.mappings(level)))
 
-        # Find unmapped items (only those that actually exist in the configs)
-        result.unmapped_old = sorted(old_items - mapped_old)
-        result.unmapped_new = sorted(new_items - mapped_new)
+        # Find unmapped items (only those that actually exist in the configs).
+        # The registry keeps the mapped names per level, so this is just a set difference.
+        result.unmapped_old = old_items - self.registry.mapped_old(level)
+        result.unmapped_new = new_items - self.registry.mapped_new(level)
 
         return result
 
     def compare_workflows(self) -> ComparisonResult:
         """Compare workflows."""
-        old_workflows = get_workflow_names(self.old)
-        new_workflows = get_workflow_names(self.new)
-        mappings = self.registry.get_workflow_mappings()
-
-        result = self.compare_level("workflows", old_workflows, new_workflows, mappings)
+        result = self.compare_level("workflows", self.old_index.workflow_names,
+                                    self.new_index.workflow_names)
         self.results["workflows"] = result
         return result
 
     def compare_jobs_in_workflow(self, old_workflow: Optional[str], new_workflow: Optional[str],
                                  workflow_key: str) -> ComparisonResult:
         """Compare jobs within a mapped workflow pair."""
-        old_jobs = set(get_workflow_jobs(self.old, old_workflow)) if old_workflow else set()
-        new_jobs = set(get_workflow_jobs(self.new, new_workflow)) if new_workflow else set()
+        old_jobs = frozenset(self.old_index.workflow_jobs.get(old_workflow, ()))
+        new_jobs = frozenset(self.new_index.workflow_jobs.get(new_workflow, ()))
 
-        mappings = self.registry.get_job_mappings(workflow_key)
-
-        result = self.compare_level(f"jobs:{workflow_key}", old_jobs, new_jobs, mappings)
-        self.results[f"jobs:{workflow_key}"] = result
+        level = sys.intern(f"jobs:{workflow_key}")
+        result = self.compare_level(level, old_jobs, new_jobs)
+        self.results[level] = result
         return result
 
     def compare_steps_in_job(self, old_job: Optional[str], new_job: Optional[str],
                             job_key: str) -> ComparisonResult:
         """Compare steps within a mapped job pair."""
-        old_steps = get_job_steps(self.old, old_job) if old_job else []
-        new_steps = get_job_steps(self.new, new_job) if new_job else []
-
-        old_step_ids = set(get_step_identifier(s) for s in old_steps)
-        new_step_ids = set(get_step_identifier(s) for s in new_steps)
+        old_step_ids = self.old_index.job_step_ids.get(old_job, frozenset())
+        new_step_ids = self.new_index.job_step_ids.get(new_job, frozenset())
 
-        mappings = self.registry.get_step_mappings(job_key)
-
-        result = self.compare_level(f"steps:{job_key}", old_step_ids, new_step_ids, mappings)
-        self.results[f"steps:{job_key}"] = result
+        level = sys.intern(f"steps:{job_key}")
+        result = self.compare_level(level, old_step_ids, new_step_ids)
+        self.results[level] = result
         return result
 
-    def compare_commands(self) -> ComparisonResult:
-        """Compare command definitions."""
-        old_cmds = get_command_names(self.old)
-        new_cmds = get_command_names(self.new)
-        mappings = self.registry.commands
-
-        result = self.compare_level("commands", old_cmds, new_cmds, mappings)
-        self.results["commands"] = result
-        return result
-
-    def compare_parameters(self) -> ComparisonResult:
-        """Compare parameters."""
-        old_params = get_parameter_names(self.old)
-        new_params = get_parameter_names(self.new)
-        mappings = self.registry.parameters
-
-        result = self.compare_level("parameters", old_params, new_params, mappings)
-        self.results["parameters"] = result
-        return result
-
-    def compare_orbs(self) -> ComparisonResult:
-        """Compare orbs."""
-        old_orbs = get_orb_names(self.old)
-        new_orbs = get_orb_names(self.new)
-        mappings = self.registry.orbs
-
-        result = self.compare_level("orbs", old_orbs, new_orbs, mappings)
-        self.results["orbs"] = result
-        return result
+    def compare_top_level(self) -> list[ComparisonResult]:
+        """Compare command, parameter and orb definitions in one pass."""
+        buckets = (
+            ("commands", self.old_index.command_names, self.new_index.command_names),
+            ("parameters", self.old_index.parameter_names, self.new_index.parameter_names),
+            ("orbs", self.old_index.orb_names, self.new_index.orb_names),
+        )
+        results = []
+        for level, old_items, new_items in buckets:
+            result = self.compare_level(level, old_items, new_items)
+            self.results[level] = result
+            results.append(result)
+        return results
 
     def run_hierarchical(self) -> dict[str, ComparisonResult]:
         """
         Run hierarchical comparison.
 
-        Stops at each level if there are unmapped items.
+        Stops at each level if there are unmapped items. With fail_fast, the
+        jobs level also stops at the first workflow with unmapped jobs instead
+        of comparing the remaining workflows.
         """
         # Level 1: Workflows
         wf_result = self.compare_workflows()
@@ -336,58 +842,32 @@ class Comparator:
 
         # Level 2: Jobs (for each mapped workflow)
         all_jobs_mapped = True
+        job_results: list[ComparisonResult] = []
         for mapping in wf_result.mapped:
-            if mapping.mapping_type == MappingType.ONE_TO_ONE:
-                # Use a key that works for lookups
-                workflow_key = f"{mapping.old_name}:{mapping.new_name}"
-                job_result = self.compare_jobs_in_workflow(
-                    mapping.old_name, mapping.new_name, workflow_key
-                )
-                if job_result.has_unmapped:
-                    all_jobs_mapped = False
-            elif mapping.mapping_type == MappingType.ADDITION:
-                # New workflow with no old equivalent - compare against empty
-                workflow_key = f"_:{mapping.new_name}"
-                job_result = self.compare_jobs_in_workflow(
-                    None, mapping.new_name, workflow_key
-                )
-                if job_result.has_unmapped:
-                    all_jobs_mapped = False
-            elif mapping.mapping_type == MappingType.REMOVAL:
-                # Old workflow with no new equivalent - compare against empty
-                workflow_key = f"{mapping.old_name}:_"
-                job_result = self.compare_jobs_in_workflow(
-                    mapping.old_name, None, workflow_key
-                )
-                if job_result.has_unmapped:
-                    all_jobs_mapped = False
+            # Additions/removals compare against an empty side (old/new name is None)
+            workflow_key = mapping.bucket_key
+            job_result = self.compare_jobs_in_workflow(
+                mapping.old_name, mapping.new_name, workflow_key
+            )
+            job_results.append(job_result)
+            if job_result.has_unmapped:
+                all_jobs_mapped = False
+                if self.fail_fast:
+                    break
 
         if not all_jobs_mapped:
             return self.results
 
-        # Level 3: Steps (for each mapped job)
-        for wf_mapping in wf_result.mapped:
-            if wf_mapping.mapping_type == MappingType.ONE_TO_ONE:
-                workflow_key = f"{wf_mapping.old_name}:{wf_mapping.new_name}"
-            elif wf_mapping.mapping_type == MappingType.ADDITION:
-                workflow_key = f"_:{wf_mapping.new_name}"
-            elif wf_mapping.mapping_type == MappingType.REMOVAL:
-                workflow_key = f"{wf_mapping.old_name}:_"
-            else:
-                continue
-
-            job_mappings = self.registry.get_job_mappings(workflow_key)
-            for job_mapping in job_mappings:
+        # Level 3: Steps (for each mapped job, reusing the Level 2 workflow results)
+        for job_result in job_results:
+            for job_mapping in job_result.mapped:
                 if job_mapping.mapping_type == MappingType.ONE_TO_ONE:
-                    job_key = f"{job_mapping.old_name}:{job_mapping.new_name}"
                     self.compare_steps_in_job(
-                        job_mapping.old_name, job_mapping.new_name, job_key
+                        job_mapping.old_name, job_mapping.new_name, job_mapping.bucket_key
                     )
 
         # Also compare top-level items
-        self.compare_commands()
-        self.compare_parameters()
-        self.compare_orbs()
+        self.compare_top_level()
 
         return self.results
 
@@ -400,65 +880,86 @@ class Comparator:
 class Reporter:
     """Reports comparison results."""
 
-    def __init__(self, results: dict[str, ComparisonResult]):
+    def __init__(self, results: dict[str, ComparisonResult], suggest: bool = False):
         self.results = results
+        self.suggest = suggest  # Print auto-suggested mappings for unmapped items
 
     def print_result(self, result: ComparisonResult):
         """Print a single comparison result."""
-        print(f"\n{'=' * 80}")
-        print(f"LEVEL: {result.level}")
-        print('=' * 80)
+        sys.stdout.write("\n".join(self.format_result(result)) + "\n")
+
+    def format_result(self, result: ComparisonResult) -> list[str]:
+        """Format a single comparison result as output lines."""
+        lines = [
+            f"\n{'=' * 80}",
+            f"LEVEL: {result.level}",
+            '=' * 80,
+        ]
 
         if result.mapped:
-            print(f"\nMAPPED ({len(result.mapped)}):")
+            lines.append(f"\nMAPPED ({len(result.mapped)}):")
             for m in result.mapped:
                 if m.mapping_type == MappingType.ONE_TO_ONE:
-                    print(f"  ↔ {m.old_name} ↔ {m.new_name}")
+                    lines.append(f"  ↔ {m.old_name} ↔ {m.new_name}")
                 elif m.mapping_type == MappingType.ADDITION:
-                    print(f"  + {m.new_name} (addition)")
+                    lines.append(f"  + {m.new_name} (addition)")
                 elif m.mapping_type == MappingType.REMOVAL:
-                    print(f"  - {m.old_name} (removal)")
+                    lines.append(f"  - {m.old_name} (removal)")
                 if m.comment:
-                    print(f"      Comment: {m.comment}")
+                    lines.append(f"      Comment: {m.comment}")
 
         if result.unmapped_old:
-            print(f"\nUNMAPPED IN OLD ({len(result.unmapped_old)}):")
-            for name in result.unmapped_old:
-                print(f"  ? {name}")
+            lines.append(f"\nUNMAPPED IN OLD ({len(result.unmapped_old)}):")
+            lines.extend(f"  ? {name}" for name in result.unmapped_old_sorted)
 
         if result.unmapped_new:
-            print(f"\nUNMAPPED IN NEW ({len(result.unmapped_new)}):")
-            for name in result.unmapped_new:
-                print(f"  ? {name}")
+            lines.append(f"\nUNMAPPED IN NEW ({len(result.unmapped_new)}):")
+            lines.extend(f"  ? {name}" for name in result.unmapped_new_sorted)
+
+        if self.suggest and result.unmapped_old and result.unmapped_new:
+            suggestions = auto_suggest_mappings(result.unmapped_old, result.unmapped_new)
+            if suggestions:
+                lines.append(f"\nSUGGESTED ({len(suggestions)}):")
+                for m in suggestions:
+                    lines.append(f"  ~ {m.old_name} ↔ {m.new_name}")
+                    lines.append(f"      Comment: {m.comment}")
 
         if result.is_fully_mapped:
-            print(f"\n✓ Level '{result.level}' is fully mapped")
+            lines.append(f"\n✓ Level '{result.level}' is fully mapped")
         else:
-            print(f"\n✗ Level '{result.level}' has unmapped items - STOPPING HERE")
+            lines.append(f"\n✗ Level '{result.level}' has unmapped items - STOPPING HERE")
+
+        return lines
 
     def print_all(self):
         """Print all results."""
-        for level, result in self.results.items():
-            self.print_result(result)
+        lines = []
+        for result in self.results.values():
+            lines.extend(self.format_result(result))
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
 
     def print_summary(self):
         """Print a summary."""
-        print(f"\n{'=' * 80}")
-        print("SUMMARY")
-        print('=' * 80)
+        lines = [
+            f"\n{'=' * 80}",
+            "SUMMARY",
+            '=' * 80,
+        ]
 
         total_unmapped = 0
         for level, result in self.results.items():
             status = "✓" if result.is_fully_mapped else "✗"
             unmapped = len(result.unmapped_old) + len(result.unmapped_new)
             total_unmapped += unmapped
-            print(f"  {status} {level}: {len(result.mapped)} mapped, {unmapped} unmapped")
+            lines.append(f"  {status} {level}: {len(result.mapped)} mapped, {unmapped} unmapped")
 
-        print()
+        lines.append("")
         if total_unmapped == 0:
-            print("All items are mapped!")
+            lines.append("All items are mapped!")
         else:
-            print(f"Total unmapped items: {total_unmapped}")
+            lines.append(f"Total unmapped items: {total_unmapped}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 # =============================================================================
@@ -466,45 +967,24 @@ class Reporter:
 # =============================================================================
 
 
-def create_default_registry() -> MappingsRegistry:
+DEFAULT_MAPPINGS_PATH = Path(__file__).with_name("mappings.yaml")
+
+
+def create_default_registry(mappings_path: Path = DEFAULT_MAPPINGS_PATH,
+                            use_cache: bool = True) -> MappingsRegistry:
     """
     Create registry with approved mappings.
 
-    THIS IS WHERE USER-APPROVED MAPPINGS GO.
-    Each mapping should be added here after user approval.
+    User-approved mappings live in mappings.yaml next to this script.
+    Each mapping should be added there after user approval. Only a missing
+    default file is treated as "no mappings yet"; any other path must exist.
     """
     registry = MappingsRegistry()
-
-    # =========================================================================
-    # WORKFLOW MAPPINGS (user-approved)
-    # =========================================================================
-
-
-    # =========================================================================
-    # JOB MAPPINGS (user-approved, grouped by workflow key)
-    # =========================================================================
-
-
-    # =========================================================================
-    # STEP MAPPINGS (user-approved, grouped by job key)
-    # =========================================================================
-
-
-    # =========================================================================
-    # COMMAND MAPPINGS (user-approved)
-    # =========================================================================
-
-
-    # =========================================================================
-    # PARAMETER MAPPINGS (user-approved)
-    # =========================================================================
-
-
-    # =========================================================================
-    # ORB MAPPINGS (user-approved)
-    # =========================================================================
-
-
+    if not mappings_path.exists():
+        if mappings_path == DEFAULT_MAPPINGS_PATH:
+            return registry
+        raise FileNotFoundError(f"Mappings file not found: {mappings_path}")
+    registry.load_from_dict(load_yaml(mappings_path, use_cache) or {})
     return registry
 
 
@@ -516,24 +996,37 @@ def main():
     parser.add_argument("--new", type=Path,
                        default=Path("docspring/.circleci/main.yml"),
                        help="Path to new (cigen-generated) config")
+    parser.add_argument("--no-cache", action="store_true",
+                       help=f"Always re-parse YAML instead of using {CACHE_DIR}")
+    parser.add_argument("--fail-fast", action="store_true",
+                       help="Stop at the first workflow with unmapped jobs")
+    parser.add_argument("--suggest", action="store_true",
+                       help="Suggest one-to-one mappings for unmapped items by name similarity")
+    parser.add_argument("--mappings", type=Path, default=DEFAULT_MAPPINGS_PATH,
+                       help="Path to the approved mappings file")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Parse the two configs in parallel processes when > 1")
     args = parser.parse_args()
 
+    # Create registry with approved mappings (first, so a bad --mappings path fails fast)
+    try:
+        registry = create_default_registry(args.mappings, use_cache=not args.no_cache)
+    except (FileNotFoundError, ValueError) as e:
+        parser.error(str(e))
+
     print(f"OLD: {args.old}")
     print(f"NEW: {args.new}")
 
     # Load configs
     config_pair = ConfigPair(args.old, args.new)
-    config_pair.load()
-
-    # Create registry with approved mappings
-    registry = create_default_registry()
+    config_pair.load(use_cache=not args.no_cache, workers=args.workers)
 
     # Run comparison
-    comparator = Comparator(config_pair, registry)
+    comparator = Comparator(config_pair, registry, fail_fast=args.fail_fast)
     results = comparator.run_hierarchical()
 
     # Report
-    reporter = Reporter(results)
+    reporter = Reporter(results, suggest=args.suggest)
     reporter.print_all()
     reporter.print_summary()
 
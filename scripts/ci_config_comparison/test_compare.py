@@ -0,0 +1,265 @@
+"""
+Regression checks for compare.py.
+
+Run with: python -m unittest discover scripts/ci_config_comparison
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import compare  # noqa: E402
+from compare import (  # noqa: E402
+    Comparator,
+    ConfigIndex,
+    ConfigPair,
+    MappingsRegistry,
+    MappingType,
+    auto_suggest_mappings,
+    create_default_registry,
+    extract_config,
+    indel_ratio,
+    mutual_best_pairs,
+    similarity_matrix,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class ExtractingLoaderTest(unittest.TestCase):
+    def assert_matches_safe_load(self, path: Path):
+        with open(path, "rb") as f:
+            expected = ConfigIndex.build(yaml.safe_load(f))
+        self.assertEqual(ConfigIndex.build(extract_config(path)), expected)
+
+    def test_top_level_anchor_outside_schema(self):
+        path = FIXTURES / "anchored_defaults.yml"
+        self.assert_matches_safe_load(path)
+
+        index = ConfigIndex.build(extract_config(path))
+        self.assertEqual(index.job_step_ids["build"], {"checkout", "run:Install gems"})
+        self.assertEqual(index.job_step_ids["lint"], {"checkout", "run:Lint"})
+        self.assertEqual(index.workflow_jobs["build_test_deploy"],
+                         ("build", "test", "lint", "deploy"))
+
+    def write_config(self, text: str) -> Path:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = Path(tmp.name) / "config.yml"
+        path.write_text(text)
+        return path
+
+    def assert_rejected_like_safe_load(self, path: Path, error: type):
+        with open(path, "rb") as f, self.assertRaises(error):
+            yaml.safe_load(f)
+        with self.assertRaises(error):
+            extract_config(path)
+
+    def test_multiple_documents_rejected(self):
+        path = self.write_config("jobs: {build: {steps: [checkout]}}\n---\njobs: {}\n")
+        self.assert_rejected_like_safe_load(path, yaml.composer.ComposerError)
+
+    def test_unknown_tag_in_skipped_subtree_rejected(self):
+        path = self.write_config(
+            "executors: {ruby: !custom {image: ruby}}\n"
+            "jobs: {build: {docker: [!custom {image: ruby}], steps: [checkout]}}\n"
+        )
+        self.assert_rejected_like_safe_load(path, yaml.constructor.ConstructorError)
+
+
+class ConfigCacheTest(unittest.TestCase):
+    def test_rewriting_config_replaces_stale_cache_entry(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        config = Path(tmp.name) / "config.yml"
+        cache_dir = Path(tmp.name) / "cache"
+
+        with mock.patch.object(compare, "CACHE_DIR", cache_dir):
+            config.write_text("jobs: {build: {steps: [checkout]}}\n")
+            compare.load_config(config)
+            first = list(cache_dir.glob("*.pkl"))
+
+            config.write_text("jobs: {build: {steps: [checkout]}, test: {steps: []}}\n")
+            loaded = compare.load_config(config)
+            second = list(cache_dir.glob("*.pkl"))
+
+            fingerprint = repr(compare.CONFIG_SCHEMA)
+            self.assertEqual(compare._cache_path(config, "extract", fingerprint), second[0])
+            with mock.patch.object(compare, "_CACHE_VERSION", compare._CACHE_VERSION + 1):
+                bumped = compare._cache_path(config, "extract", fingerprint)
+
+        self.assertEqual(set(loaded["jobs"]), {"build", "test"})
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first, second)
+        self.assertNotEqual(bumped, second[0])
+
+
+class MappingsFileTest(unittest.TestCase):
+    def write_mappings(self, text: str) -> Path:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = Path(tmp.name) / "mappings.yaml"
+        path.write_text(text)
+        return path
+
+    def test_load_from_dict(self):
+        registry = MappingsRegistry()
+        registry.load_from_dict({
+            "workflows": [{"old": "test_build_deploy", "new": "main", "comment": "renamed"},
+                          {"new": "package_updates"}],
+            "jobs": {"test_build_deploy:main": [{"old": "rspec_amd64", "new": "ci_rspec"}]},
+            "orbs": [{"old": "git-shallow-clone"}],
+        })
+
+        workflows = registry.get_workflow_mappings()
+        self.assertEqual([m.mapping_type for m in workflows],
+                         [MappingType.ONE_TO_ONE, MappingType.ADDITION])
+        self.assertEqual(workflows[0].comment, "renamed")
+        self.assertEqual(registry.mapped_old("workflows"), {"test_build_deploy"})
+        self.assertEqual(registry.mapped_new("workflows"), {"main", "package_updates"})
+        self.assertEqual(registry.mapped_new("jobs:test_build_deploy:main"), {"ci_rspec"})
+        self.assertEqual(registry.mapped_old("orbs"), {"git-shallow-clone"})
+
+    def test_load_from_dict_rejects_unknown_key(self):
+        registry = MappingsRegistry()
+        with self.assertRaisesRegex(ValueError, r"\['nwe'\].*'jobs:ci:ci'"):
+            registry.load_from_dict({"jobs": {"ci:ci": [{"old": "a", "nwe": "b"}]}})
+        self.assertEqual(registry.mapped_old("jobs:ci:ci"), set())
+
+    def test_load_from_dict_rejects_non_mapping_entry(self):
+        with self.assertRaisesRegex(ValueError, r"'workflows'.*'ci'"):
+            MappingsRegistry().load_from_dict({"workflows": ["ci"]})
+
+    def test_create_default_registry_from_file(self):
+        path = self.write_mappings(
+            "workflows:\n"
+            "  - {old: test_build_deploy, new: main}\n"
+            "commands:\n"
+            "  - {old: shallow_checkout, new: cigen_shallow_checkout}\n"
+        )
+        registry = create_default_registry(path, use_cache=False)
+        self.assertEqual(registry.mapped_new("workflows"), {"main"})
+        self.assertEqual(registry.mapped_old("commands"), {"shallow_checkout"})
+
+    def test_create_default_registry_rejects_typo_in_file(self):
+        path = self.write_mappings("workflows:\n  - {old: test_build_deploy, nwe: main}\n")
+        with self.assertRaisesRegex(ValueError, "nwe"):
+            create_default_registry(path, use_cache=False)
+
+    def test_create_default_registry_missing_path(self):
+        with self.assertRaises(FileNotFoundError):
+            create_default_registry(Path("/nonexistent/mappings.yaml"), use_cache=False)
+
+
+class ComparatorTest(unittest.TestCase):
+    OLD = {"workflows": {"build": {"jobs": ["lint", "test"]},
+                         "deploy": {"jobs": ["lint", "release"]}}}
+    NEW = {"workflows": {"build": {"jobs": ["ci_lint", "test"]},
+                         "deploy": {"jobs": ["lint", "ship"]}}}
+
+    def compare(self, registry: MappingsRegistry, **kwargs) -> dict:
+        pair = ConfigPair(Path("old.yml"), Path("new.yml"),
+                          old_index=ConfigIndex.build(self.OLD),
+                          new_index=ConfigIndex.build(self.NEW))
+        return Comparator(pair, registry, **kwargs).run_hierarchical()
+
+    def workflow_registry(self) -> MappingsRegistry:
+        registry = MappingsRegistry()
+        for name in ("build", "deploy"):
+            registry.add_workflow_mapping(name, name, MappingType.ONE_TO_ONE)
+        return registry
+
+    def test_mapped_and_unmapped_come_from_the_same_bucket(self):
+        registry = self.workflow_registry()
+        registry.add_job_mapping("build:build", "lint", "ci_lint", MappingType.ONE_TO_ONE)
+        registry.add_job_mapping("build:build", "test", "test", MappingType.ONE_TO_ONE)
+
+        results = self.compare(registry)
+        build = results["jobs:build:build"]
+        self.assertEqual([(m.old_name, m.new_name) for m in build.mapped],
+                         [("lint", "ci_lint"), ("test", "test")])
+        self.assertFalse(build.has_unmapped)
+        # The build mappings must not leak into the deploy workflow's bucket.
+        deploy = results["jobs:deploy:deploy"]
+        self.assertEqual(deploy.mapped, [])
+        self.assertEqual(deploy.unmapped_old, {"lint", "release"})
+        self.assertEqual(deploy.unmapped_new, {"lint", "ship"})
+
+    def test_fail_fast_stops_at_first_workflow_with_unmapped_jobs(self):
+        # "build" is compared first and none of its jobs are mapped.
+        self.assertIn("jobs:deploy:deploy", self.compare(self.workflow_registry()))
+        results = self.compare(self.workflow_registry(), fail_fast=True)
+        self.assertTrue(results["jobs:build:build"].has_unmapped)
+        self.assertNotIn("jobs:deploy:deploy", results)
+
+
+class SuggestionTest(unittest.TestCase):
+    OLD = ["convox_create_release_eu", "convox_promote_eu", "rspec_amd64", "merge_branch"]
+    NEW = ["deploy_eu_pre_release", "deploy_eu_promote", "ci_rspec", "post_deploy_merge"]
+
+    def test_indel_ratio(self):
+        self.assertEqual(indel_ratio("", ""), 1.0)
+        self.assertEqual(indel_ratio("abc", ""), 0.0)
+        self.assertEqual(indel_ratio("ab", "abc"), 0.8)
+        # 2 * LCS(12) / (21 + 24) = 0.533, above the 0.5 cutoff; difflib's ratio gives 0.444
+        self.assertAlmostEqual(
+            indel_ratio("deploy_eu_pre_release", "convox_create_release_eu"), 24 / 45)
+
+    def test_fallback_matrix_uses_indel_ratio(self):
+        with mock.patch.object(compare, "cdist", None):
+            matrix = similarity_matrix(self.OLD, self.NEW)
+        self.assertEqual(matrix, [[indel_ratio(o, n) for n in self.NEW] for o in self.OLD])
+
+    @unittest.skipIf(compare.cdist is None, "rapidfuzz not installed")
+    def test_rapidfuzz_matches_fallback(self):
+        fast = similarity_matrix(self.OLD, self.NEW)
+        with mock.patch.object(compare, "cdist", None):
+            slow = similarity_matrix(self.OLD, self.NEW)
+            slow_suggestions = auto_suggest_mappings(set(self.OLD), set(self.NEW))
+        for fast_row, slow_row in zip(fast, slow):
+            for fast_score, slow_score in zip(fast_row, slow_row):
+                self.assertAlmostEqual(fast_score, slow_score)
+        self.assertEqual(auto_suggest_mappings(set(self.OLD), set(self.NEW)), slow_suggestions)
+
+    def test_mutual_best_pairs_across_rounds(self):
+        # Row 1 also prefers column 0, so it only pairs with column 1 once row 0 has taken 0.
+        scores = [[0.9, 0.8],
+                  [0.85, 0.6]]
+        self.assertEqual(mutual_best_pairs(scores, 0.5), [(0, 0), (1, 1)])
+
+    def test_mutual_best_pairs_threshold(self):
+        scores = [[0.9, 0.1],
+                  [0.1, 0.4]]
+        self.assertEqual(mutual_best_pairs(scores, 0.5), [(0, 0)])
+        self.assertEqual(mutual_best_pairs(scores, 0.4), [(0, 0), (1, 1)])
+        self.assertEqual(mutual_best_pairs([], 0.5), [])
+        self.assertEqual(mutual_best_pairs([[]], 0.5), [])
+
+    def test_mutual_best_pairs_ties_go_to_lowest_index(self):
+        # Column 1 ties between rows 0 and 1 and goes to row 0, holding (1, 1) back a round.
+        scores = [[0.7, 0.7],
+                  [0.1, 0.7]]
+        self.assertEqual(mutual_best_pairs(scores, 0.5), [(0, 0), (1, 1)])
+        # Row 0 ties between both columns; column 0 wins and row 1 is left below the cutoff.
+        scores = [[0.8, 0.8],
+                  [0.8, 0.1]]
+        self.assertEqual(mutual_best_pairs(scores, 0.5), [(0, 0)])
+
+    def test_auto_suggest_mappings(self):
+        suggestions = auto_suggest_mappings({"js_lint", "api_proxy", "unrelated"},
+                                            {"ci_api_proxy", "ci_js_lint", "zzz"})
+        self.assertEqual([(m.old_name, m.new_name) for m in suggestions],
+                         [("api_proxy", "ci_api_proxy"), ("js_lint", "ci_js_lint")])
+        self.assertTrue(all(m.mapping_type is MappingType.ONE_TO_ONE for m in suggestions))
+        self.assertEqual(auto_suggest_mappings({"alpha"}, {"zzz"}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,16 @@ import json
 import os
 import sys
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
 # Function to load YAML, handling potential errors
 def load_yaml(filepath):
     try:
-        with open(filepath, 'r') as f:
-            return yaml.safe_load(f)
+        with open(filepath, 'rb') as f:
+            return yaml.load(f, Loader=SafeLoader)
     except FileNotFoundError:
         print(f"Error: File not found at {filepath}", file=sys.stderr)
         sys.exit(1)
@@ -69,7 +74,6 @@ def main():
         'merge_branch': 'post_deploy_merge',
         'patch_approval_jobs_status': 'post_deploy_patch_approval_jobs_status', # Verify exact name
         'patch_approve_deploy_all': 'post_deploy_patch_approve_deploy_all',
-        'patch_approve_deploy_all': 'post_deploy_patch_approve_deploy_all',
         'postman_staging': 'deploy_staging_postman',
         'prettier': 'ci_prettier',
         'rspec_amd64': 'ci_rspec',
@@ -84,7 +88,8 @@ def main():
     print(f"Total Old Jobs: {len(old_jobs)}")
     print(f"Total New Jobs: {len(new_jobs)}")
 
-    mapped_old_jobs = set(job_mapping.keys())
+    # Dict key views support set operations directly, no copy needed
+    mapped_old_jobs = job_mapping.keys()
     mapped_new_jobs = set(job_mapping.values())
 
     # Check for missing mappings (Old jobs not in mapping)